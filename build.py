@@ -10,13 +10,19 @@ from pylib.editor_producer import editor_producers
 from pylib.gz_compressor_producer import gz_compressor_producers
 from pylib.imagepack import item_image_producers
 from pylib.landing_page_producer import landing_page_producers
-from pylib.producer import Producer, Scheduler, SingleFile, GenericProducer, producer_copyfile, copy_file_with_hash
+from pylib.producer import Producer, Scheduler, SingleFile, GenericProducer, BuildCache, producer_copyfile, copy_file_with_hash
 from pylib.producer_plugins import plugins_producers
 from pylib.typescript_producer import typescript_producer
 from pylib.uglifyjs import uglify_js_producer
 from pylib.yaml_linter_producer import resource_list_parser_producers
 
 
+# The scheduler's record of what each creator was last built from. It, and the
+# temporary file used to save it, are written by the build itself so they are
+# never treated as source files.
+BUILD_INDEX_FILE = "cache/build_index.json"
+
+
 # CLI Argument Flags
 # FLAG_skip_js_lint = False
 # FLAG_skip_index = False
@@ -200,8 +206,9 @@ def main() -> None:
         producer_list=producers,
         initial_filepaths=Scheduler.all_paths_in_dir(
             base_dir=".",
-            ignore_paths=["venv_docker", "venv", ".git", "node_modules", "output_master"]
-        )
+            ignore_paths=["venv_docker", "venv", ".git", "node_modules", "output_master", BUILD_INDEX_FILE]
+        ),
+        build_cache=BuildCache(BUILD_INDEX_FILE),
     )
 
 
@@ -217,21 +224,37 @@ def main() -> None:
         observer.start()
         try:
             while True:
-                event_type, src_path = q.get(True)
-
-                # TODO: Use .get_nowait after a successful "get" so we can bundle
-                # anything in the queue together into a single operation to the
-                # scheduler objects, instead of sending each file one by one.
-
-                if event_type == 'created' or event_type == 'modified':
-                    scheduler.add_or_update_files([src_path])
-                elif event_type == 'deleted':
-                    scheduler.delete_files([src_path])
-                elif event_type == 'closed':
-                    # A file was closed, does not seem as useful as modified
-                    pass
-                else:
-                    print("Unknown Event", event_type)
+                # Block until there is at least one event, then drain anything
+                # else that is already queued so that a burst of changes, such
+                # as saving several files or switching branches, is sent to the
+                # scheduler as a single operation instead of one file at a time.
+                events = [q.get(True)]
+                while True:
+                    try:
+                        events.append(q.get_nowait())
+                    except queue.Empty:
+                        break
+
+                # Map each file to whether it exists after its latest event
+                changed_files: Dict[str, bool] = {}
+                for event_type, src_path in events:
+                    if event_type == 'created' or event_type == 'modified':
+                        changed_files[src_path] = True
+                    elif event_type == 'deleted':
+                        changed_files[src_path] = False
+                    elif event_type == 'closed':
+                        # A file was closed, does not seem as useful as modified
+                        pass
+                    else:
+                        print("Unknown Event", event_type)
+
+                deleted_files = [path for path, exists in changed_files.items() if not exists]
+                updated_files = [path for path, exists in changed_files.items() if exists]
+
+                if len(deleted_files) > 0:
+                    scheduler.delete_files(deleted_files)
+                if len(updated_files) > 0:
+                    scheduler.add_or_update_files(updated_files)
 
         except:
             observer.stop()
@@ -248,7 +271,11 @@ class Handler(FileSystemEventHandler):
         if event.is_directory:
             return
 
-        self.event_queue.put((event.event_type, event.src_path[2:]))
+        path = event.src_path[2:]
+        if path.startswith(BUILD_INDEX_FILE):
+            return
+
+        self.event_queue.put((event.event_type, path))
 
 
 
@@ -11,6 +11,7 @@ from pylib.producer import Producer, SingleFile, GenericProducer, filename_from_
 from pylib.resource_list import ResourceList, Resource, StackSize, Recipe, get_primitive
 from pylib.uglifyjs import uglify_js_string
 from pylib.webminify import minify_css_blocks
+from pylib.yaml_linter_producer import get_simple_name
 
 
 ################################################################################
@@ -160,24 +161,12 @@ def calculator_function(input_files: CalculatorInputFiles, output_files: SingleF
         f.write(minified_calculator)
 
     # Sanity Check Warning, is there an image that does not have a recipe
-    simple_resources = [x["simplename"] for x in html_resource_data]
+    simple_resources = set(x["simplename"] for x in html_resource_data)
     for simple_name in resource_image_coordinates:
         if simple_name not in simple_resources:
             print("WARNING:", simple_name, "has an image but no recipe and will not appear in the calculator")
 
 
-# TODO: Move to shared library to be used in other places?
-################################################################################
-# get_simple_name checks if a simple name override has been set for the
-# resource, and if it has then returns it. Otherwise it generates the simple
-# name from the resource's actual name.
-################################################################################
-def get_simple_name(resource: str, resources: OrderedDict[str, Resource]) -> str:
-    # TODO: Change this if we end up implementing something like "is_set()" for the YAML conversions
-    if resources[resource].custom_simplename != "":
-        return resources[resource].custom_simplename
-    return re.sub(r'[^a-z0-9]', '', resource.lower())
-
 ################################################################################
 # get_simple_names_only generates an object of custom_simplenames only for
 # resources where a simple name override has been set.
@@ -308,7 +297,7 @@ def generate_resource_offset_classes(resources: OrderedDict[str, Resource], reso
 
         if simple_name in resource_image_coordinates:
             x_coordinate, y_coordinate = resource_image_coordinates[simple_name]
-            item_styles[simple_name] = "background-position: " + str(-x_coordinate) + "px " + str(-y_coordinate) + "px;"
+            item_styles[simple_name] = "background-position: {}px {}px;".format(-x_coordinate, -y_coordinate)
         else:
             item_styles[simple_name] = "background: #f0f; background-image: none;"
             print("WARNING:", simple_name, "has a recipe but no image and will appear purple in the calculator")
@@ -1,6 +1,5 @@
 from typing import List, Dict, Tuple
 import gzip
-import shutil
 
 from pylib.producer import Producer, SingleFile, GenericProducer
 
@@ -40,15 +39,26 @@ def gz_compress_paths(input_files: SingleFile, categories: Dict[str, str]) -> Tu
     )
 
 
+# Compression level 6 gets nearly all of the size reduction of the default
+# level 9 while running noticeably faster on the larger javascript files.
+GZ_COMPRESSION_LEVEL = 6
+
+
 ################################################################################
 # gz_compress_function
 #
 # Takes the input file and gz compresses it into the output file without
-# deleting the original.
+# deleting the original. The output pages are at most a few megabytes so the
+# whole file is compressed with a single call into zlib instead of being
+# streamed through the gzip file object chunk by chunk. The gzip header
+# timestamp is zeroed so that identical inputs always produce identical files.
 ################################################################################
 def gz_compress_function(input_files: SingleFile, output_files: SingleFile) -> None:
     output_file = output_files["file"]
     input_file = input_files["file"]
 
-    with open(input_file, 'rb') as infile, gzip.open(output_file, 'wb') as outfile:
-        shutil.copyfileobj(infile, outfile)
+    with open(input_file, 'rb') as infile:
+        data = infile.read()
+
+    with open(output_file, 'wb') as outfile:
+        outfile.write(gzip.compress(data, compresslevel=GZ_COMPRESSION_LEVEL, mtime=0))
@@ -4,10 +4,9 @@ import json
 import math
 import os
 import re
-import shutil
 import subprocess
 
-from pylib.producer import Producer, MultiFile, SingleFile, GenericProducer
+from pylib.producer import Producer, MultiFile, SingleFile, GenericProducer, copyfile
 
 
 ################################################################################
@@ -176,7 +175,7 @@ def image_compress_function(input_files: SingleFile, output_files: SingleFile) -
     output_file = output_files["file"]
 
     # Copy the file
-    shutil.copyfile(input_file, output_file)
+    copyfile(input_file, output_file)
 
     try:
         subprocess.run(["pngquant", "--force", "--ext", ".png", "256", "--nofs", output_file])
@@ -198,4 +197,4 @@ def image_copy_function(input_file: str, match: "re.Match[str]", output_files: L
     output_file = output_files[0]
 
     # Copy the file
-    shutil.copyfile(input_file, output_file)
+    copyfile(input_file, output_file)
@@ -3,8 +3,7 @@ from typing import List, Dict, Tuple, TypedDict
 import json
 import os
 from pylib.filehash import getfilehash
-from pylib.producer import Producer, SingleFile, filename_from_metadatafile, GenericProducer
-import shutil
+from pylib.producer import Producer, SingleFile, filename_from_metadatafile, GenericProducer, copyfile
 
 
 
@@ -76,7 +75,7 @@ def hash_and_copy_file(input_files: SingleFile, output_files: SingleHashedFile)
     output_metadata_file: str = output_files["filemetadata"]
 
     # Copy the file
-    shutil.copyfile(input_file, output_file)
+    copyfile(input_file, output_file)
 
     # Write the hashed file name to a known location
     with open(output_metadata_file, 'w') as f:
@@ -1,9 +1,12 @@
 from typing import Callable, List, TypedDict, Dict, Tuple
+import errno
 import os
 import shutil
 import json
+import sys
 
 from pylib.filehash import getfilehash
+from .build_cache import BuildCache
 from .producer import Producer, GenericProducer
 from .scheduler import Scheduler
 
@@ -18,6 +21,48 @@ class MultiFile(TypedDict):
     files: List[str]
 
 
+# The linux ioctl request number for FICLONE
+FICLONE = 0x40049409
+
+# The errors FICLONE fails with when the filesystem cannot create reflinks.
+# EXDEV is not included because it only means that the two files are on
+# different filesystems, and other copies may still be able to use reflinks.
+REFLINK_UNSUPPORTED_ERRNOS = {errno.EOPNOTSUPP, errno.EINVAL, errno.ENOTTY}
+
+# Cleared the first time a reflink fails because the filesystem does not support
+# them, so that later copies go straight to shutil.copyfile() instead of making
+# a clone attempt that is known to fail.
+REFLINK_SUPPORTED = sys.platform == "linux"
+
+
+################################################################################
+# copyfile
+#
+# Copies the contents of one file to another. On filesystems that support
+# reflinks, such as btrfs and XFS, the new file is created as a clone that
+# shares the data blocks of the original so no data is actually copied. On any
+# other filesystem this falls back to shutil.copyfile(), which already uses a
+# zero-copy sendfile() on linux.
+################################################################################
+def copyfile(input_file: str, output_file: str) -> None:
+    global REFLINK_SUPPORTED
+
+    # Opening the destination truncates it, so copying a file onto itself is
+    # left to shutil.copyfile() which raises SameFileError instead.
+    is_same_file = os.path.exists(output_file) and os.path.samefile(input_file, output_file)
+
+    if REFLINK_SUPPORTED and not is_same_file:
+        import fcntl
+        try:
+            with open(input_file, 'rb') as source, open(output_file, 'wb') as destination:
+                fcntl.ioctl(destination.fileno(), FICLONE, source.fileno())
+            return
+        except OSError as e:
+            if e.errno in REFLINK_UNSUPPORTED_ERRNOS:
+                REFLINK_SUPPORTED = False
+
+    shutil.copyfile(input_file, output_file)
+
 
 # Convenience function for situations where all that needs to be done is to
 # copy a single input to a single output
@@ -26,7 +71,7 @@ def producer_copyfile(input_files: SingleFile, output_files: SingleFile) -> None
     output_file: str = output_files["file"]
 
     # Copy the file
-    shutil.copyfile(input_file, output_file)
+    copyfile(input_file, output_file)
 
 
 def single_file_static_output_path(output_file: str) -> Callable[[SingleFile, Dict[str,str]], Tuple[SingleFile, SingleFile]]:
@@ -118,7 +163,7 @@ def function_for_copy_file_with_hash(input_files: SingleFile, output_files: Sing
     output_metadata_file: str = output_files["hash_metadata_file"]
 
     # Copy the file
-    shutil.copyfile(input_file, output_file)
+    copyfile(input_file, output_file)
 
     # Write the hashed file name to a known location
     with open(output_metadata_file, 'w') as f:
@@ -166,6 +211,7 @@ def filename_from_metadatafile(metadata_file: str, rel: str = "") -> str:
             return os.path.relpath(json.load(f)["filename"], rel)
 
 __all__ = [
+    "BuildCache",
     "Producer",
     "GenericProducer",
     "Scheduler",
@@ -0,0 +1,249 @@
+from typing import Any, Callable, Dict, Iterable, Optional, TypedDict
+import hashlib
+import json
+import os
+import types
+
+from .creator import Creator
+
+
+GenericCreator = Creator[Any, Any]
+
+
+# Included in every creator digest. Increment this to invalidate all previously
+# recorded builds, for example when a change to a helper that creator functions
+# call should cause every file that uses it to be rebuilt.
+BUILD_CACHE_VERSION = 1
+
+
+class BuildCacheEntry(TypedDict):
+    # The digest of the inputs the creator was last run with
+    digest: str
+
+    # The modification time of each output file right after the creator ran
+    outputs: Dict[str, int]
+
+
+################################################################################
+# BuildCache
+#
+# A record of the contents of the input files that each creator was last run
+# with. File modification times are not a reliable signal that a file has
+# changed, for example git will rewrite the timestamp of every file it checks
+# out even when the contents end up identical. When the scheduler sees that an
+# output is older than its inputs it can check this cache to find out if the
+# input contents actually changed before re-running the creator.
+#
+# The modification time of every output file is recorded along with the input
+# digest, and a creator is only skipped while its outputs still have exactly
+# those times. Deleting or rewriting an output, including a creator that ran in
+# a build that was interrupted before the index was saved, will always force
+# its creator to run again.
+################################################################################
+class BuildCache:
+    # The file the index is loaded from and saved to
+    index_file: str
+
+    # A map of each creator's key to what it was last run with and produced
+    index: Dict[str, BuildCacheEntry]
+
+    # If the index has changed since it was loaded or last saved
+    dirty: bool
+
+    ############################################################################
+    #
+    ############################################################################
+    def __init__(self, index_file: str):
+        self.index_file = index_file
+        self.index = {}
+        self.dirty = False
+
+        if os.path.exists(index_file):
+            try:
+                with open(index_file) as f:
+                    self.index = json.load(f)
+            except (OSError, ValueError):
+                # A corrupt index just means every creator is checked by its
+                # timestamps alone until it is rebuilt.
+                self.index = {}
+
+    ############################################################################
+    # is_unchanged
+    #
+    # Returns True if the creator was last run with input files that have the
+    # same contents as the input files do now, and its output files have not
+    # been touched since then.
+    ############################################################################
+    def is_unchanged(self, creator: GenericCreator, digest: Optional[str]) -> bool:
+        if digest is None:
+            return False
+
+        entry = self.index.get(BuildCache.creator_key(creator))
+        if not isinstance(entry, dict) or entry.get("digest") != digest:
+            return False
+
+        return entry.get("outputs") == get_output_modified_times(creator)
+
+    ############################################################################
+    # record
+    #
+    # Saves the digest of the inputs that a creator was just run with, along
+    # with the modification times of the outputs it just wrote.
+    ############################################################################
+    def record(self, creator: GenericCreator, digest: Optional[str]) -> None:
+        key = BuildCache.creator_key(creator)
+        output_modified_times = get_output_modified_times(creator)
+
+        if digest is None or output_modified_times is None:
+            if key in self.index:
+                del self.index[key]
+                self.dirty = True
+            return
+
+        entry: BuildCacheEntry = {
+            "digest": digest,
+            "outputs": output_modified_times,
+        }
+        if self.index.get(key) != entry:
+            self.index[key] = entry
+            self.dirty = True
+
+    ############################################################################
+    # prune
+    #
+    # Remove the records of any creators that are not in the given list, so that
+    # entries for creators that no longer exist do not build up in the index.
+    # Creators that are left out of a build, such as the calculators skipped
+    # by a limited build, lose their records and are checked by their
+    # timestamps alone until they are built again.
+    ############################################################################
+    def prune(self, creators: Iterable[GenericCreator]) -> None:
+        creator_keys = set(BuildCache.creator_key(creator) for creator in creators)
+
+        for key in list(self.index.keys()):
+            if key not in creator_keys:
+                del self.index[key]
+                self.dirty = True
+
+    ############################################################################
+    # save
+    #
+    # Write the index to disk if it has changed. A temporary file is used so
+    # that an interrupted build never leaves a partially written index behind.
+    ############################################################################
+    def save(self) -> None:
+        if not self.dirty:
+            return
+
+        index_directory = os.path.dirname(self.index_file)
+        if index_directory != "" and not os.path.exists(index_directory):
+            os.makedirs(index_directory)
+
+        temporary_index_file = self.index_file + ".tmp"
+        with open(temporary_index_file, 'w') as f:
+            json.dump(self.index, f, sort_keys=True)
+        os.replace(temporary_index_file, self.index_file)
+        self.dirty = False
+
+    ############################################################################
+    # creator_key
+    #
+    # Each output file can only be generated by one creator at a time, so the
+    # output files of a creator are used to identify it between builds.
+    ############################################################################
+    @staticmethod
+    def creator_key(creator: GenericCreator) -> str:
+        return json.dumps(sorted(creator.flat_output_paths()))
+
+    ############################################################################
+    # creator_digest
+    #
+    # Hashes the name and bytecode of the function a creator calls along with
+    # the path and contents of each of its input files. Returns None if any
+    # input is not a regular file because those inputs cannot be reliably
+    # hashed.
+    #
+    # Only the creator function itself is hashed, not the functions or external
+    # tools that it calls, so BUILD_CACHE_VERSION needs to be incremented when
+    # one of those changes what a creator outputs.
+    ############################################################################
+    @staticmethod
+    def creator_digest(creator: GenericCreator) -> Optional[str]:
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update("{}\n{}.{}\n".format(
+            BUILD_CACHE_VERSION,
+            getattr(creator.function, "__module__", ""),
+            getattr(creator.function, "__qualname__", repr(creator.function)),
+        ).encode("utf-8"))
+        update_function_digest(digest, creator.function)
+
+        for input_file in sorted(creator.flat_input_paths()):
+            if not os.path.isfile(input_file):
+                return None
+
+            digest.update(input_file.encode("utf-8") + b"\n")
+            digest.update(get_file_digest(input_file) + b"\n")
+
+        return digest.hexdigest()
+
+
+################################################################################
+# update_function_digest
+#
+# Adds the bytecode of a function, and of any functions defined inside of it,
+# to a digest so that editing the function invalidates the builds it made.
+################################################################################
+def update_function_digest(digest: "hashlib._Hash", function: Callable[..., Any]) -> None:
+    code = getattr(function, "__code__", None)
+    if code is not None:
+        update_code_digest(digest, code)
+
+
+def update_code_digest(digest: "hashlib._Hash", code: types.CodeType) -> None:
+    digest.update(code.co_code)
+    digest.update(repr(code.co_names).encode("utf-8"))
+
+    for constant in code.co_consts:
+        if isinstance(constant, types.CodeType):
+            update_code_digest(digest, constant)
+        elif isinstance(constant, frozenset):
+            # The iteration order of a frozenset is not stable between runs
+            digest.update(repr(sorted(repr(value) for value in constant)).encode("utf-8"))
+        else:
+            digest.update(repr(constant).encode("utf-8"))
+
+
+################################################################################
+# get_output_modified_times
+#
+# Get the modification time of each of a creator's output files. Returns None
+# if any of the outputs do not exist.
+################################################################################
+def get_output_modified_times(creator: GenericCreator) -> Optional[Dict[str, int]]:
+    modified_times: Dict[str, int] = {}
+    for output_file in creator.flat_output_paths():
+        try:
+            modified_times[output_file] = os.stat(output_file).st_mtime_ns
+        except FileNotFoundError:
+            return None
+    return modified_times
+
+
+################################################################################
+# get_file_digest
+#
+# Hash the contents of a single file, reading it in chunks so that large files
+# do not need to be loaded into memory all at once.
+################################################################################
+def get_file_digest(filepath: str) -> bytes:
+    BUF_SIZE = 1024 * 1024
+
+    digest = hashlib.blake2b(digest_size=16)
+    with open(filepath, 'rb') as f:
+        while True:
+            data = f.read(BUF_SIZE)
+            if not data:
+                break
+            digest.update(data)
+
+    return digest.digest()
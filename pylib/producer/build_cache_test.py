@@ -0,0 +1,202 @@
+from typing import Any
+import os
+import tempfile
+import unittest
+
+from .build_cache import BuildCache
+from .creator import Creator
+
+
+def function(input_files: Any, output_files: Any) -> None:
+    return None  # pragma: no cover
+
+
+def other_function(input_files: Any, output_files: Any) -> None:
+    return None  # pragma: no cover
+
+
+def edited_function(input_files: Any, output_files: Any) -> None:
+    print("edited")  # pragma: no cover
+
+
+# Pretend edited_function is a new version of function
+edited_function.__qualname__ = function.__qualname__
+
+
+class Build_Cache_Tests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.input_file = os.path.join(self.tempdir.name, "input.txt")
+        self.output_file = os.path.join(self.tempdir.name, "output.txt")
+        self.index_file = os.path.join(self.tempdir.name, "cache", "build_index.json")
+
+        self.write_input("original contents")
+        self.write_output("original output", 1000000000123)
+
+        self.creator: Creator[Any, Any] = Creator(
+            input_paths={"file": self.input_file},
+            output_paths={"file": self.output_file},
+            function=function,
+            categories=["test"],
+        )
+
+    def tearDown(self) -> None:
+        self.tempdir.cleanup()
+
+    def write_input(self, contents: str) -> None:
+        with open(self.input_file, "w") as f:
+            f.write(contents)
+
+    def write_output(self, contents: str, modified_time_ns: int) -> None:
+        with open(self.output_file, "w") as f:
+            f.write(contents)
+        os.utime(self.output_file, ns=(modified_time_ns, modified_time_ns))
+
+    ############################################################################
+    # test_unchanged_contents
+    #
+    # Test that rewriting an input file with the same contents is detected as
+    # unchanged, and that the record survives being saved and reloaded.
+    ############################################################################
+    def test_unchanged_contents(self) -> None:
+        build_cache = BuildCache(self.index_file)
+        build_cache.record(self.creator, BuildCache.creator_digest(self.creator))
+        build_cache.save()
+
+        self.write_input("original contents")
+
+        reloaded_build_cache = BuildCache(self.index_file)
+        self.assertTrue(reloaded_build_cache.is_unchanged(self.creator, BuildCache.creator_digest(self.creator)))
+
+    ############################################################################
+    # test_changed_contents
+    #
+    # Test that changing the contents of an input file is detected.
+    ############################################################################
+    def test_changed_contents(self) -> None:
+        build_cache = BuildCache(self.index_file)
+        build_cache.record(self.creator, BuildCache.creator_digest(self.creator))
+
+        self.write_input("new contents")
+
+        self.assertFalse(build_cache.is_unchanged(self.creator, BuildCache.creator_digest(self.creator)))
+
+    ############################################################################
+    # test_changed_function
+    #
+    # Test that a creator with the same files but a different function is not
+    # treated as unchanged.
+    ############################################################################
+    def test_changed_function(self) -> None:
+        build_cache = BuildCache(self.index_file)
+        build_cache.record(self.creator, BuildCache.creator_digest(self.creator))
+
+        other_creator: Creator[Any, Any] = Creator(
+            input_paths={"file": self.input_file},
+            output_paths={"file": self.output_file},
+            function=other_function,
+            categories=["test"],
+        )
+
+        self.assertFalse(build_cache.is_unchanged(other_creator, BuildCache.creator_digest(other_creator)))
+
+    ############################################################################
+    # test_missing_input
+    #
+    # Test that a creator with a missing input file is never treated as
+    # unchanged.
+    ############################################################################
+    def test_missing_input(self) -> None:
+        build_cache = BuildCache(self.index_file)
+        build_cache.record(self.creator, BuildCache.creator_digest(self.creator))
+
+        os.remove(self.input_file)
+
+        self.assertIsNone(BuildCache.creator_digest(self.creator))
+        self.assertFalse(build_cache.is_unchanged(self.creator, BuildCache.creator_digest(self.creator)))
+
+    ############################################################################
+    # test_changed_output
+    #
+    # Test that a creator whose output was rewritten after it was recorded is
+    # not treated as unchanged, even if its inputs are the same. This happens
+    # when a build is interrupted after a creator ran but before the index was
+    # saved and the inputs are then reverted.
+    ############################################################################
+    def test_changed_output(self) -> None:
+        build_cache = BuildCache(self.index_file)
+        build_cache.record(self.creator, BuildCache.creator_digest(self.creator))
+
+        self.write_output("interrupted output", 2000000000123)
+
+        self.assertFalse(build_cache.is_unchanged(self.creator, BuildCache.creator_digest(self.creator)))
+
+    ############################################################################
+    # test_missing_output
+    #
+    # Test that a creator whose output was deleted is never treated as
+    # unchanged.
+    ############################################################################
+    def test_missing_output(self) -> None:
+        build_cache = BuildCache(self.index_file)
+        build_cache.record(self.creator, BuildCache.creator_digest(self.creator))
+
+        os.remove(self.output_file)
+
+        self.assertFalse(build_cache.is_unchanged(self.creator, BuildCache.creator_digest(self.creator)))
+
+    ############################################################################
+    # test_save_only_when_changed
+    #
+    # Test that the index is only written when a record actually changed it,
+    # so that a build where nothing ran does not touch any files.
+    ############################################################################
+    def test_save_only_when_changed(self) -> None:
+        build_cache = BuildCache(self.index_file)
+        build_cache.save()
+        self.assertFalse(os.path.exists(self.index_file))
+
+        build_cache.record(self.creator, BuildCache.creator_digest(self.creator))
+        build_cache.save()
+        self.assertTrue(os.path.exists(self.index_file))
+
+        # Recording the same run again leaves nothing new to save
+        os.remove(self.index_file)
+        build_cache.record(self.creator, BuildCache.creator_digest(self.creator))
+        build_cache.save()
+        self.assertFalse(os.path.exists(self.index_file))
+
+    ############################################################################
+    # test_edited_function
+    #
+    # Test that editing the code of the function a creator calls is not
+    # treated as unchanged even though the function has the same name.
+    ############################################################################
+    def test_edited_function(self) -> None:
+        build_cache = BuildCache(self.index_file)
+        build_cache.record(self.creator, BuildCache.creator_digest(self.creator))
+
+        edited_creator: Creator[Any, Any] = Creator(
+            input_paths={"file": self.input_file},
+            output_paths={"file": self.output_file},
+            function=edited_function,
+            categories=["test"],
+        )
+
+        self.assertFalse(build_cache.is_unchanged(edited_creator, BuildCache.creator_digest(edited_creator)))
+
+    ############################################################################
+    # test_prune
+    #
+    # Test that pruning removes the records of creators that no longer exist
+    # and keeps the records of the ones that do.
+    ############################################################################
+    def test_prune(self) -> None:
+        build_cache = BuildCache(self.index_file)
+        build_cache.record(self.creator, BuildCache.creator_digest(self.creator))
+
+        build_cache.prune([self.creator])
+        self.assertTrue(build_cache.is_unchanged(self.creator, BuildCache.creator_digest(self.creator)))
+
+        build_cache.prune([])
+        self.assertEqual(build_cache.index, {})
@@ -0,0 +1,84 @@
+from unittest import mock
+import errno
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+from pylib import producer
+
+
+class Copyfile_Tests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.input_file = os.path.join(self.tempdir.name, "input.txt")
+        self.output_file = os.path.join(self.tempdir.name, "output.txt")
+
+        with open(self.input_file, "w") as f:
+            f.write("original contents")
+
+        self.reflink_supported = producer.REFLINK_SUPPORTED
+        producer.REFLINK_SUPPORTED = sys.platform == "linux"
+
+    def tearDown(self) -> None:
+        producer.REFLINK_SUPPORTED = self.reflink_supported
+        self.tempdir.cleanup()
+
+    def read_file(self, path: str) -> str:
+        with open(path) as f:
+            return f.read()
+
+    ############################################################################
+    # test_copy
+    #
+    # Test that the contents of the input file are copied to the output file.
+    ############################################################################
+    def test_copy(self) -> None:
+        producer.copyfile(self.input_file, self.output_file)
+        self.assertEqual(self.read_file(self.output_file), "original contents")
+
+    ############################################################################
+    # test_same_file
+    #
+    # Test that copying a file onto itself, directly or through a symlink,
+    # raises an error without truncating the file.
+    ############################################################################
+    def test_same_file(self) -> None:
+        with self.assertRaises(shutil.SameFileError):
+            producer.copyfile(self.input_file, self.input_file)
+        self.assertEqual(self.read_file(self.input_file), "original contents")
+
+        os.symlink(self.input_file, self.output_file)
+        with self.assertRaises(shutil.SameFileError):
+            producer.copyfile(self.input_file, self.output_file)
+        self.assertEqual(self.read_file(self.input_file), "original contents")
+
+    ############################################################################
+    # test_reflink_unsupported
+    #
+    # Test that a filesystem without reflink support falls back to a regular
+    # copy and stops trying to create reflinks for later copies.
+    ############################################################################
+    @unittest.skipUnless(sys.platform == "linux", "reflinks are only attempted on linux")
+    def test_reflink_unsupported(self) -> None:
+        with mock.patch("fcntl.ioctl", side_effect=OSError(errno.EOPNOTSUPP, "Operation not supported")) as ioctl:
+            producer.copyfile(self.input_file, self.output_file)
+            self.assertEqual(self.read_file(self.output_file), "original contents")
+            self.assertFalse(producer.REFLINK_SUPPORTED)
+
+            producer.copyfile(self.input_file, self.output_file)
+            self.assertEqual(ioctl.call_count, 1)
+
+    ############################################################################
+    # test_reflink_cross_device
+    #
+    # Test that a copy between two filesystems falls back to a regular copy
+    # without stopping later copies from trying to create reflinks.
+    ############################################################################
+    @unittest.skipUnless(sys.platform == "linux", "reflinks are only attempted on linux")
+    def test_reflink_cross_device(self) -> None:
+        with mock.patch("fcntl.ioctl", side_effect=OSError(errno.EXDEV, "Invalid cross-device link")):
+            producer.copyfile(self.input_file, self.output_file)
+            self.assertEqual(self.read_file(self.output_file), "original contents")
+            self.assertTrue(producer.REFLINK_SUPPORTED)
@@ -1,13 +1,15 @@
-from typing import List, Callable, Any, Optional, Tuple, Dict, Set
+from typing import List, Callable, Any, Optional, Tuple, Dict, Set, Iterator
 import os
 import re
 import sqlite3
+import stat
 import sys
 import time
 import json
 
 from .producer import GenericProducer
 from .creator import Creator
+from .build_cache import BuildCache
 from pylib.unique_heap import UniqueHeap
 from pylib.terminal_color import fg_gray
 
@@ -56,8 +58,14 @@ class Scheduler:
     # A map of input files to the creator index that consume them
     input_file_maps: Dict[str, Set[CreatorIndexType]]
 
+    # The bound match function for each field regex of each producer
+    producer_field_matchers: List[List[Tuple[str, Callable[[str], Optional["re.Match[str]"]]]]]
+
     filecache: sqlite3.Connection
 
+    # An optional record of the input contents each creator was last run with
+    build_cache: Optional[BuildCache]
+
     verbose: bool = False
 
     ############################################################################
@@ -68,15 +76,24 @@ class Scheduler:
         # producers: List[GenericProducer],
         producer_list: List[GenericProducer],
         # filepaths: List[str] = []
-        initial_filepaths: List[str] = []
+        initial_filepaths: List[str] = [],
+        build_cache: Optional[BuildCache] = None,
     ):
         self.producer_list = producer_list
+        self.build_cache = build_cache
         self.creator_list = {}
         # self.last_creator_list_index = -1
         # self.creator_producer = {}
         self.output_file_maps = {}
         self.input_file_maps = {}
 
+        # Pre-bind the match function of every field regex once, instead of
+        # looking them up for every file that is added or deleted.
+        self.producer_field_matchers = [
+            [(field_name, pattern.match) for field_name, pattern in producer.regex_field_patterns().items()]
+            for producer in self.producer_list
+        ]
+
         self.filecache = self.init_producer_cache(self.producer_list)
 
         self.add_or_update_files(initial_filepaths)
@@ -155,20 +172,13 @@ class Scheduler:
         self.delete_creators_with_input_files(files)
 
         # Insert or update all files in the database
-        for producer_index, producer in enumerate(self.producer_list):
-            for path in files:
-                for field_name, pattern in producer.regex_field_patterns().items():
-                    match: Optional[re.Match[str]] = re.match(pattern, path)
+        for producer_index, field_name, path, match in self.match_files(files):
+            # Delete the file from the database if it exists
+            self.remove_file_from_database(self.filecache, producer_index, field_name, path)
 
-                    if match is None:
-                        continue
-
-                    # Delete the file from the database if it exists
-                    self.remove_file_from_database(self.filecache, producer_index, field_name, path)
-
-                    # Insert a file into the database. If it already exists then
-                    # it is updated to be marked as a fresh file.
-                    self.insert_new_file(self.filecache, producer_index, field_name, path, match.groupdict())
+            # Insert a file into the database. If it already exists then
+            # it is updated to be marked as a fresh file.
+            self.insert_new_file(self.filecache, producer_index, field_name, path, match.groupdict())
 
 
 
@@ -230,6 +240,28 @@ class Scheduler:
 
         return new_creators
 
+    ############################################################################
+    # match_files
+    #
+    # Match a list of files against the field regexes of every producer and
+    # return the producer index, field name, file, and match object of every
+    # successful match.
+    ############################################################################
+    def match_files(self, files: List[str]) -> List[Tuple[ProducerIndexType, str, str, "re.Match[str]"]]:
+        matches: List[Tuple[ProducerIndexType, str, str, re.Match[str]]] = []
+
+        for producer_index, field_matchers in enumerate(self.producer_field_matchers):
+            for path in files:
+                for field_name, field_matcher in field_matchers:
+                    match: Optional[re.Match[str]] = field_matcher(path)
+
+                    if match is None:
+                        continue
+
+                    matches.append((producer_index, field_name, path, match))
+
+        return matches
+
     ############################################################################
     # process_files
     #
@@ -268,6 +300,16 @@ class Scheduler:
                 if oldest_output > newest_input:
                     continue
 
+            # Check if the contents of the input files are actually different
+            # from the last time this creator was run, even if their
+            # timestamps say otherwise. The build cache also checks that the
+            # output files are still the ones that run produced.
+            input_digest: Optional[str] = None
+            if self.build_cache is not None:
+                input_digest = BuildCache.creator_digest(creator)
+                if self.build_cache.is_unchanged(creator, input_digest):
+                    continue
+
             # Build creators for any of the files generated by this creator
             # They will be picked up in the next step where we add them to the
             # creators_to_update variable.
@@ -325,35 +367,49 @@ class Scheduler:
             duration = time.time() - start
             print(fg_gray("  Completed in {:.2f}s".format(duration)))
 
+            if self.build_cache is not None:
+                self.build_cache.record(creator, input_digest)
+
+        if self.build_cache is not None:
+            self.build_cache.prune(self.creator_list.values())
+            self.build_cache.save()
+
     ############################################################################
     # all_paths_in_dir
     #
     # A helper function to use for initial_filepaths when you want to add all
-    # of the files under a particular directory.
+    # of the files under a particular directory. Ignored directories are pruned
+    # as soon as they are seen so that large trees like node_modules are never
+    # read at all.
     ############################################################################
     @staticmethod
     def all_paths_in_dir(base_dir: str, ignore_paths: List[str]) -> List[str]:
         paths: List[str] = []
+        directories: List[str] = [base_dir]
 
-        for root, dirs, files in os.walk(base_dir):
-            # Strip the "current directory" prefix because that makes it more
-            # annoying to match things on.
-            if root.startswith("./"):
-                root = root[2:]
-
-            # Add all of the files and directories unless the path matches an ignore path
-            for path in dirs + files:
-                full_path = os.path.join(root, path)
-
-                skip = False
-                for ignore_path in ignore_paths:
-                    if full_path.startswith(ignore_path):
-                        skip = True
-                        break
-                if skip:
-                    continue
+        # str.startswith() accepts a tuple and checks every prefix in one call
+        ignore_prefixes = tuple(ignore_paths)
+
+        while len(directories) > 0:
+            with os.scandir(directories.pop()) as entries:
+                for entry in entries:
+                    full_path = entry.path
+
+                    # Strip the "current directory" prefix because that makes
+                    # it more annoying to match things on.
+                    if full_path.startswith("./"):
+                        full_path = full_path[2:]
+
+                    # Add all of the files and directories unless the path matches an ignore path
+                    if full_path.startswith(ignore_prefixes):
+                        continue
 
-                paths.append(full_path)
+                    paths.append(full_path)
+
+                    # Like os.walk(), list symlinked directories but do not
+                    # descend into them.
+                    if entry.is_dir(follow_symlinks=False):
+                        directories.append(full_path)
 
         return paths
 
@@ -364,15 +420,8 @@ class Scheduler:
         # self.remove_file_from_database
 
         # Delete all files to delete in the database
-        for producer_index, producer in enumerate(self.producer_list):
-            for path in files:
-                for field_name, pattern in producer.regex_field_patterns().items():
-                    match: Optional[re.Match[str]] = re.match(pattern, path)
-
-                    if match is None:
-                        continue
-
-                    self.remove_file_from_database(self.filecache, producer_index, field_name, path)
+        for producer_index, field_name, path, match in self.match_files(files):
+            self.remove_file_from_database(self.filecache, producer_index, field_name, path)
 
 
         pass
@@ -804,66 +853,65 @@ def build_required_directories(files: List[str]) -> None:
 ################################################################################
 # get_newest_modified_time
 #
-# This function takes in a list of files and returns the most recent time any
-# of them were modified.
+# This function takes in a list of files and returns the most recent time, in
+# integer nanoseconds, any of them were modified.
 ################################################################################
-def get_newest_modified_time(paths: List[str]) -> float:
-    return get_aggregated_modified_time(
-        paths=paths,
-        aggregator=max,
-        default=sys.float_info.max,
+def get_newest_modified_time(paths: List[str]) -> int:
+    return max(
+        iterate_modified_times(paths, missing_time=sys.maxsize),
+        default=sys.maxsize,
     )
 
 
 ################################################################################
 # get_oldest_modified_time
 #
-# This function takes in a list of files and returns the least recent time any
-# of them were modified.
+# This function takes in a list of files and returns the least recent time, in
+# integer nanoseconds, any of them were modified.
 ################################################################################
-def get_oldest_modified_time(paths: List[str]) -> float:
-    return get_aggregated_modified_time(
-        paths=paths,
-        aggregator=min,
+def get_oldest_modified_time(paths: List[str]) -> int:
+    return min(
+        iterate_modified_times(paths, missing_time=0),
         default=0,
     )
 
 
 ################################################################################
-# get_aggregated_modified_time
+# iterate_modified_times
 #
 # A helper function for get_newest_modified_time() and get_oldest_modified_time()
-# which use almost identical logic save for the default values of non existent
-# files, and the aggregator function used over all of the file ages.
+# which yields the st_mtime_ns of every file in the list, descending into
+# any directories. Missing files yield `missing_time` instead. Directories are
+# read with os.scandir() so that the file type of each child comes from the
+# directory listing instead of an extra stat() call, and an explicit stack of
+# directories is used instead of recursion.
 ################################################################################
-def get_aggregated_modified_time(
-    paths: List[str],
-    aggregator: Callable[[List[float]], float],
-    default: float
-) -> float:
-    # Duplicate the paths list so we can modify it. This allows us to avoid
-    # recursion by just appending the values.
-    paths = list(paths)
-    time_list: List[float] = []
+def iterate_modified_times(paths: List[str], missing_time: int) -> Iterator[int]:
+    directories: List[str] = []
+
     for path in paths:
-        # If a path is missing add the default value instead
-        if not os.path.exists(path):
-            time_list.append(default)
+        try:
+            stat_result = os.stat(path)
+        except OSError:
+            yield missing_time
             continue
 
-        # If a path is a directory add all its children to the paths list
-        if (os.path.isdir(path)):
-            for subpath in os.listdir(path):
-                paths.append(os.path.join(path, subpath))
+        if stat.S_ISDIR(stat_result.st_mode):
+            directories.append(path)
         else:
-            time_list.append(os.path.getmtime(path))
+            yield stat_result.st_mtime_ns
 
-    # Sanity check that there are timestamps in the list before passing them
-    # to the aggregator.
-    if len(time_list) == 0:
-        return default
+    while len(directories) > 0:
+        with os.scandir(directories.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    directories.append(entry.path)
+                    continue
 
-    return aggregator(time_list)
+                try:
+                    yield entry.stat().st_mtime_ns
+                except OSError:
+                    yield missing_time
 
 
 ################################################################################
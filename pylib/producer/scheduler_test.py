@@ -1,9 +1,13 @@
 from typing import Dict, List, Tuple, TypedDict
+import os
+import shutil
+import tempfile
 import unittest
 
+from .build_cache import BuildCache
 from .creator import Creator
 from .producer import Producer
-from .scheduler import Scheduler
+from .scheduler import Scheduler, get_newest_modified_time, get_oldest_modified_time
 
 
 # TODO: dont use scheduler.build_new_creators() instead just create the files
@@ -1228,3 +1232,225 @@ class Remove_Query_Tests(unittest.TestCase):
 
 class Filesets_Query_Tests(unittest.TestCase):
     pass
+
+
+class Modified_Time_Tests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.base_dir = self.tempdir.name
+
+        os.makedirs(os.path.join(self.base_dir, "folder", "subfolder"))
+        self.write_file("top.txt", 2000000000123)
+        self.write_file(os.path.join("folder", "middle.txt"), 1000000000123)
+        self.write_file(os.path.join("folder", "subfolder", "bottom.txt"), 3000000000123)
+
+    def tearDown(self) -> None:
+        self.tempdir.cleanup()
+
+    def write_file(self, path: str, modified_time_ns: int) -> None:
+        full_path = os.path.join(self.base_dir, path)
+        with open(full_path, "w") as f:
+            f.write(path)
+        os.utime(full_path, ns=(modified_time_ns, modified_time_ns))
+
+    ############################################################################
+    # test_nested_directories
+    #
+    # Test that files inside of nested directories are included when finding
+    # the newest and oldest modified times.
+    ############################################################################
+    def test_nested_directories(self) -> None:
+        paths = [
+            os.path.join(self.base_dir, "top.txt"),
+            os.path.join(self.base_dir, "folder"),
+        ]
+        self.assertEqual(get_newest_modified_time(paths), 3000000000123)
+        self.assertEqual(get_oldest_modified_time(paths), 1000000000123)
+
+    ############################################################################
+    # test_missing_file
+    #
+    # Test that a missing file is treated as infinitely new when finding the
+    # newest time and infinitely old when finding the oldest time.
+    ############################################################################
+    def test_missing_file(self) -> None:
+        paths = [
+            os.path.join(self.base_dir, "top.txt"),
+            os.path.join(self.base_dir, "missing.txt"),
+        ]
+        self.assertGreater(get_newest_modified_time(paths), 3000000000123)
+        self.assertEqual(get_oldest_modified_time(paths), 0)
+
+
+class All_Paths_In_Dir_Tests(unittest.TestCase):
+    ############################################################################
+    # test_ignore_paths
+    #
+    # Test that every file and directory is listed except for the ones that
+    # match an ignore path, and that ignored directories are not descended into.
+    ############################################################################
+    def test_ignore_paths(self) -> None:
+        with tempfile.TemporaryDirectory() as base_dir:
+            os.makedirs(os.path.join(base_dir, "folder", "subfolder"))
+            os.makedirs(os.path.join(base_dir, "ignored", "subfolder"))
+            for path in [
+                os.path.join("folder", "subfolder", "file.txt"),
+                os.path.join("ignored", "subfolder", "file.txt"),
+                "file.txt",
+            ]:
+                with open(os.path.join(base_dir, path), "w") as f:
+                    f.write(path)
+
+            self.assertCountEqual(
+                Scheduler.all_paths_in_dir(
+                    base_dir=base_dir,
+                    ignore_paths=[os.path.join(base_dir, "ignored")],
+                ),
+                [
+                    os.path.join(base_dir, "folder"),
+                    os.path.join(base_dir, "folder", "subfolder"),
+                    os.path.join(base_dir, "folder", "subfolder", "file.txt"),
+                    os.path.join(base_dir, "file.txt"),
+                ]
+            )
+
+
+class SingleFile(TypedDict):
+    file: str
+
+
+def copy_paths(input_files: SingleFile, groups: Dict[str, str]) -> Tuple[SingleFile, SingleFile]:
+    return (input_files, {"file": "out/output_" + groups["name"] + ".txt"})
+
+
+def final_paths(input_files: SingleFile, groups: Dict[str, str]) -> Tuple[SingleFile, SingleFile]:
+    return (input_files, {"file": "final/final_" + groups["name"] + ".txt"})
+
+
+class Build_Cache_Integration_Tests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.original_working_directory = os.getcwd()
+        os.chdir(self.tempdir.name)
+
+        self.runs: List[str] = []
+
+        def copy(input_files: SingleFile, output_files: SingleFile) -> None:
+            self.runs.append(output_files["file"])
+            shutil.copyfile(input_files["file"], output_files["file"])
+
+        self.producers: List[Producer[SingleFile, SingleFile]] = [
+            Producer(
+                input_path_patterns={"file": r"^input_(?P<name>[a-z]+)\.txt$"},
+                paths=copy_paths,
+                function=copy,
+                categories=["copy"],
+            ),
+            Producer(
+                input_path_patterns={"file": r"^out/output_(?P<name>[a-z]+)\.txt$"},
+                paths=final_paths,
+                function=copy,
+                categories=["final"],
+            ),
+        ]
+
+        self.write_file("input_one.txt", "original contents")
+
+    def tearDown(self) -> None:
+        os.chdir(self.original_working_directory)
+        self.tempdir.cleanup()
+
+    def write_file(self, path: str, contents: str) -> None:
+        with open(path, "w") as f:
+            f.write(contents)
+
+    def read_file(self, path: str) -> str:
+        with open(path) as f:
+            return f.read()
+
+    def set_modified_time(self, path: str, modified_time_ns: int) -> None:
+        os.utime(path, ns=(modified_time_ns, modified_time_ns))
+
+    def build(self) -> Scheduler:
+        return Scheduler(
+            producer_list=self.producers,
+            initial_filepaths=["input_one.txt"],
+            build_cache=BuildCache("build_index.json"),
+        )
+
+    ############################################################################
+    # test_touched_input
+    #
+    # Test that an input whose timestamp is newer than its outputs but whose
+    # contents are unchanged does not re-run its creator, or queue any of the
+    # creators that depend on its outputs.
+    ############################################################################
+    def test_touched_input(self) -> None:
+        self.build()
+        self.assertEqual(self.runs, ["out/output_one.txt", "final/final_one.txt"])
+
+        # Make the downstream output stale too, so re-running its creator would
+        # be noticed if it were queued.
+        self.set_modified_time("final/final_one.txt", 1000000000123)
+        self.set_modified_time("input_one.txt", os.stat("out/output_one.txt").st_mtime_ns + 1000000000)
+
+        self.runs = []
+        scheduler = self.build()
+        scheduler.add_or_update_files(["input_one.txt"])
+        self.assertEqual(self.runs, [])
+
+    ############################################################################
+    # test_missing_output
+    #
+    # Test that a creator whose inputs are unchanged still runs if its output
+    # has been deleted.
+    ############################################################################
+    def test_missing_output(self) -> None:
+        self.build()
+
+        os.remove("out/output_one.txt")
+        self.set_modified_time("final/final_one.txt", 1000000000123)
+
+        self.runs = []
+        self.build()
+        self.assertEqual(self.runs, ["out/output_one.txt", "final/final_one.txt"])
+
+    ############################################################################
+    # test_changed_input
+    #
+    # Test that changing the contents of an input re-runs its creator and the
+    # creators that depend on it.
+    ############################################################################
+    def test_changed_input(self) -> None:
+        self.build()
+
+        self.write_file("input_one.txt", "new contents")
+        self.set_modified_time("input_one.txt", os.stat("final/final_one.txt").st_mtime_ns + 1000000000)
+
+        self.runs = []
+        self.build()
+        self.assertEqual(self.runs, ["out/output_one.txt", "final/final_one.txt"])
+        self.assertEqual(self.read_file("final/final_one.txt"), "new contents")
+
+    ############################################################################
+    # test_reverted_input_after_interrupted_build
+    #
+    # Test that if a creator ran but the build stopped before the index was
+    # saved, reverting its input back to the recorded contents still re-runs
+    # the creator instead of leaving the output from the interrupted run.
+    ############################################################################
+    def test_reverted_input_after_interrupted_build(self) -> None:
+        self.build()
+
+        # Run the first creator with new contents without saving the index
+        self.write_file("input_one.txt", "new contents")
+        shutil.copyfile("input_one.txt", "out/output_one.txt")
+        self.set_modified_time("out/output_one.txt", os.stat("out/output_one.txt").st_mtime_ns + 1000000000)
+
+        self.write_file("input_one.txt", "original contents")
+        self.set_modified_time("input_one.txt", os.stat("out/output_one.txt").st_mtime_ns + 1000000000)
+
+        self.runs = []
+        self.build()
+        self.assertEqual(self.read_file("out/output_one.txt"), "original contents")
+        self.assertEqual(self.read_file("final/final_one.txt"), "original contents")
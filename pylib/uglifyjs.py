@@ -1,9 +1,8 @@
 from typing import Callable, List, Tuple, Dict
 import os
-import shutil
 import subprocess
 
-from pylib.producer import Producer, SingleFile, single_file_static_output_path
+from pylib.producer import Producer, SingleFile, single_file_static_output_path, copyfile
 
 
 ################################################################################
@@ -22,7 +21,7 @@ def uglify_copyfile(input_files: SingleFile, output_files: SingleFile) -> None:
         print("WARNING: Javascript compression failed")
         print("        ", e)
         print("        Falling back to regular copy")
-        shutil.copyfile(in_file, out_file)
+        copyfile(in_file, out_file)
 
 
 ################################################################################
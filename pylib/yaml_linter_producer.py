@@ -1,4 +1,5 @@
 from typing import List, Dict, Tuple, TypedDict, OrderedDict, Set
+import functools
 import json
 import os
 import pickle
@@ -126,11 +127,11 @@ def load_resource_list(filepath: str) -> Tuple[ResourceList, List[TokenError]]:
 # construct because it is a trivial construct.
 ################################################################################
 def expand_raw_resource(resources: OrderedDict[str, Resource]) -> OrderedDict[str, Resource]:
-    for resource in resources:
-        for i, recipe in enumerate(resources[resource].recipes):
-            if recipe.recipe_type == "Raw Resource" and recipe.output == 0 and len(recipe.requirements) == 0:
-                resources[resource].recipes[i].output = 1
-                resources[resource].recipes[i].requirements = OrderedDict([(resource, 0)])
+    for resource_name, resource in resources.items():
+        for recipe in resource.recipes:
+            if recipe.output == 0 and recipe.recipe_type == "Raw Resource" and len(recipe.requirements) == 0:
+                recipe.output = 1
+                recipe.requirements = OrderedDict([(resource_name, 0)])
     return resources
 
 
@@ -144,17 +145,33 @@ def expand_raw_resource(resources: OrderedDict[str, Resource]) -> OrderedDict[st
 # to include the data structure in the resource_list.yaml file.
 ################################################################################
 def fill_default_requirement_groups(resources: OrderedDict[str, Resource], requirement_groups: OrderedDict[str, List[str]]) -> OrderedDict[str, Resource]:
-    for resource in resources:
-        for i, recipe in enumerate(resources[resource].recipes):
-            # Create a copy of the keys so we can iterate over them and mutate them
-            requirement_list: List[str] = [requirement for requirement in recipe.requirements]
-
-            # Iterate over the requirements and replace any that are part of requirement groups
-            for requirement in requirement_list:
-                if requirement in requirement_groups:
-                    value = recipe.requirements[requirement]
-                    del recipe.requirements[requirement]
-                    recipe.requirements[requirement_groups[requirement][0]] = value
+    # Map each requirement group to the item it will be replaced with
+    default_requirements: Dict[str, str] = {
+        group_name: group_items[0]
+        for group_name, group_items in requirement_groups.items()
+        if len(group_items) > 0
+    }
+
+    for resource in resources.values():
+        for recipe in resource.recipes:
+            # Most recipes do not use any requirement groups and can be skipped
+            if default_requirements.keys().isdisjoint(recipe.requirements):
+                continue
+
+            # Rebuild the requirements in a single pass. Replaced requirements
+            # are placed after all the other requirements, and if the default
+            # item is already a requirement its value is overwritten in place.
+            kept_requirements = [
+                (requirement, value)
+                for requirement, value in recipe.requirements.items()
+                if requirement not in default_requirements
+            ]
+            replaced_requirements = [
+                (default_requirements[requirement], value)
+                for requirement, value in recipe.requirements.items()
+                if requirement in default_requirements
+            ]
+            recipe.requirements = OrderedDict(kept_requirements + replaced_requirements)
     return resources
 
 
@@ -332,6 +349,20 @@ def ensure_unique_simple_names(resources: OrderedDict[str, Resource]) -> List[To
 ################################################################################
 def get_simple_name(resource: str, resources: OrderedDict[str, Resource]) -> str:
     # TODO: Change this if we end up implementing something like "is_set()" for the YAML conversions
-    if resources[resource].custom_simplename != "":
-        return resources[resource].custom_simplename
-    return re.sub(r'[^a-z0-9]', '', resource.lower())
+    custom_simplename = resources[resource].custom_simplename
+    if custom_simplename != "":
+        return custom_simplename
+    return simplify_name(resource)
+
+
+SIMPLE_NAME_REGEX = re.compile(r'[^a-z0-9]')
+
+
+################################################################################
+# simplify_name generates the simple name for a resource name by lowercasing it
+# and stripping out every non alphanumeric character. The results are cached
+# because the same names are simplified many times while building a page.
+################################################################################
+@functools.lru_cache(maxsize=None)
+def simplify_name(name: str) -> str:
+    return SIMPLE_NAME_REGEX.sub('', name.lower())
@@ -3,6 +3,13 @@ from typing import Any, TextIO, Type
 from typing import NamedTuple
 import yaml
 
+# Use the libyaml C bindings when they are available because they parse the
+# resource lists many times faster than the pure python loader.
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader  # type: ignore
+
 
 class TokenBundle(NamedTuple):
     value: Any
@@ -38,7 +45,7 @@ def placeholder_constructor(loader: Any, node: yaml.nodes.ScalarNode) -> None:
 # grouping
 ################################################################################
 def ordered_load(stream: TextIO, object_pairs_hook: Type[object] = OrderedDict) -> Any:
-    class OrderedLoader(yaml.SafeLoader):
+    class OrderedLoader(SafeLoader):
         pass
 
     # Ordered Load